@@ -1,91 +1,108 @@
 from __future__ import annotations
 
-import math
+import hashlib
+import mmap
+import os
 import re
-from collections import deque
+import sys
 import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 import json
 
-from flask import Flask, abort, jsonify, render_template, request, send_file
+import numpy as np
+import orjson
+from flask import Flask, Response, abort, render_template, request, send_file
 
 DISPLAY_LIMIT = 25
-# How often (in iterations) to check for cancellation to avoid per-iteration
-# locking overhead. Increase to check less frequently (lower CPU cost), or
-# decrease to respond to cancellations faster.
-CANCELLATION_CHECK_INTERVAL = 128
+# How many solutions are filtered per vectorized block; the cancellation token
+# is checked once per block. Increase to check less frequently (lower CPU
+# cost), or decrease to respond to cancellations faster.
+CANCELLATION_CHECK_INTERVAL = 16384
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "static"
 SOLUTIONS_DIR = BASE_DIR / "solutions"
 ASSETS_DIR = BASE_DIR / "assets"
 ALLOWED_ASSET_TYPES = {"cards", "traits"}
+ASSET_EXTENSIONS = (".webp", ".png", ".jpg", ".jpeg") # Lookup priority
+# Browser cache lifetime (seconds) for served images (cards, traits, logos);
+# they only change on deploy.
+ASSET_MAX_AGE = 86400
 MIME_TYPES = {
     ".png": "image/png",
     ".jpg": "image/jpeg",
     ".jpeg": "image/jpeg",
     ".webp": "image/webp",
 }
+# Bytes of solution text parsed per step when loading a solution file.
+PARSE_CHUNK_SIZE = 1 << 20
+SOLUTION_FILENAME_PATTERN = re.compile(r"^solutions_(\d+)_(\d+)(?:_(4trait|44trait))?\.txt$")
 
 with open(f"{BASE_DIR}/card_dict.json", "r", encoding="utf-8") as f:
     CARD_DICT = json.load(f)
-CARD_LIST = sorted(CARD_DICT.keys())
-TRAIT_LIST = sorted(set(trait for traits in CARD_DICT.values() for trait in traits))
+# Sorted once at import and shared by every response, so keep them immutable.
+CARD_LIST = tuple(sorted(sys.intern(card) for card in CARD_DICT.keys()))
+TRAIT_LIST = tuple(sorted(sys.intern(trait) for trait in set().union(*CARD_DICT.values())))
+CARD_INDEX = {card: index for index, card in enumerate(CARD_LIST)}
+TRAIT_INDEX = {trait: index for index, trait in enumerate(TRAIT_LIST)}
+# Every solution file covers the same cards and traits, so /api/options always
+# returns this body.
+OPTIONS_BODY = orjson.dumps({"cards": CARD_LIST, "traits": TRAIT_LIST})
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
-app.config["JSON_SORT_KEYS"] = False
 
 
 @dataclass(frozen=True)
-class SolutioMask:
-    cards: int # Bitmask
-    traits:  int # Bitmask
+class SolutionColumns:
+    cards: np.ndarray # uint64 bitmask per solution
+    traits: np.ndarray # uint64 bitmask per solution
+    cards_any: int # Bits set in at least one solution
+    cards_all: int # Bits set in every solution
+    traits_any: int
+    traits_all: int
 
 @dataclass(frozen=True)
 class SolutionData:
+    # Declared by hand rather than with dataclass(slots=True), which needs
+    # Python 3.10.
+    __slots__ = ("identifier", "traits", "cards")
     identifier: int
-    traits: Tuple[Tuple[str, int], ...]
+    traits: Tuple[Dict[str, object], ...] # JSON-ready {"name", "count"} entries
     cards: Tuple[str, ...]
 
 # --------- BITFILTER LOGIC  ----------
 
+# Number of set bits for every 4-bit trait weight mask (0000 .. 1111).
+NIBBLE_WEIGHTS = tuple(bin(nibble).count("1") for nibble in range(16))
+# Card names for every possible byte value of a cards mask, one table per byte
+# (cards 0-7, 8-15, ...), so decoding takes one lookup per byte.
+CARD_BYTE_TABLES = tuple(
+    tuple(
+        tuple(card for bit, card in enumerate(CARD_LIST[offset:offset + 8]) if (byte >> bit) & 1)
+        for byte in range(256)
+    )
+    for offset in range(0, len(CARD_LIST), 8)
+)
+
 def traitsMask(weighted_traits: list[str]) -> int:
     mask = 0
     for trait, weight in weighted_traits: 
-        weight_mask = 0
-        for weight_index in range(weight):
-            weight_mask |= (1 << weight_index) # for weight 1 to 4:  0001 0011 0111 1111
-        
-        index = TRAIT_LIST.index(trait)
+        weight_mask = (1 << weight) - 1 # for weight 1 to 4:  0001 0011 0111 1111
+        index = TRAIT_INDEX[trait]
         mask |= (weight_mask << (index * 4))
     return mask
 
 def cardsMask(cards: list[str]) -> int:
     mask = 0
     for card in cards:
-        index = CARD_LIST.index(card)
+        index = CARD_INDEX[card]
         mask |= (1 << index)
     return mask
 
 
-def filterCardsForbidden(filterMask: int, cardsMask: int) -> bool:
-    return (filterMask & cardsMask) == 0
-
-def filterCardsRequired(filterMask: int, cardsMask: int) -> bool:
-    return (filterMask & cardsMask) == filterMask
-
-def filterTraitsMax1(filterMask: int, traitsMask: int) -> bool:
-    return (filterMask & traitsMask) == 0
-
-def filterTraitsMin2(filterMask: int, traitsMask: int) -> bool:
-    return (filterMask & traitsMask) == filterMask
-
-def filterTraitsMin4(filterMask: int, traitsMask: int) -> bool:
-    return (filterMask & traitsMask) == filterMask
-
-
 def cardsRequiredFilterMask(requiredCards: list[str]) -> int:
     return cardsMask(requiredCards)
 
@@ -95,14 +112,14 @@ def cardsForbiddenFilterMask(forbiddenCards: list[str]) -> int:
 def traitsMax1FilterMask(max1Traits: list[str]) -> int:
     mask = 0
     for trait in max1Traits:
-        index = TRAIT_LIST.index(trait)
+        index = TRAIT_INDEX[trait]
         mask |= (1 << (index * 4))
     return mask
 
 def traitMin2FilterMask(min2Traits: list[str]) -> int:
     mask = 0
     for trait in min2Traits:
-        index = TRAIT_LIST.index(trait)
+        index = TRAIT_INDEX[trait]
         weight_mask = 0b0011 # (0011 & x = 0011)  true for 0011, 0111, 1111  (i.e. weight >= 2)
         mask |= (weight_mask << (index * 4))
     return mask
@@ -110,65 +127,72 @@ def traitMin2FilterMask(min2Traits: list[str]) -> int:
 def traitMin4FilterMask(min4Traits: list[str]) -> int:
     mask = 0
     for trait in min4Traits:
-        index = TRAIT_LIST.index(trait)
+        index = TRAIT_INDEX[trait]
         weight_mask = 0b1111 # (1111 & x = 1111)  true for 1111 only (i.e. weight == 4)
         mask |= (weight_mask << (index * 4))
     return mask
 
 def decodeTraitsMask(traitsMask: int) -> List[Tuple[str, int]]:
     traits = []
-    for index, trait in enumerate(TRAIT_LIST):
-        weight_mask = (traitsMask >> (index * 4)) & 0b1111
-        if weight_mask != 0:
-            weight = 0
-            for bit_index in range(4):
-                if (weight_mask >> bit_index) & 1:
-                    weight += 1
-            traits.append((trait, weight))
+    for trait in TRAIT_LIST:
+        if not traitsMask:
+            break # no higher traits left
+        weight_mask = traitsMask & 0b1111
+        if weight_mask:
+            traits.append((trait, NIBBLE_WEIGHTS[weight_mask]))
+        traitsMask >>= 4
     return traits
 
 def decodeCardsMask(cardsMask: int) -> List[str]:
     cards = []
-    for index, card in enumerate(CARD_LIST):
-        if (cardsMask >> index) & 1:
-            cards.append(card)
+    for table in CARD_BYTE_TABLES:
+        if not cardsMask:
+            break # no higher cards left
+        cards.extend(table[cardsMask & 0xFF])
+        cardsMask >>= 8
     return cards
 
 # --------- END BITFILTER LOGIC  ----------
 
 
-def _sorted_unique(values: Iterable[str]) -> List[str]:
-    seen: Dict[str, str] = {}
-    for value in values:
-        key = value.lower()
-        if key not in seen:
-            seen[key] = value
-    return sorted(seen.values(), key=str.lower)
+def _parse_query_list(values: Sequence[str]) -> List[str]:
+    # Repeated parameters and comma-separated values are equivalent, so join
+    # everything and split once.
+    items = (item.strip() for item in ",".join(values).split(","))
+    return [item for item in items if item]
 
 
-def _parse_query_list(values: Sequence[str]) -> List[str]:
-    parsed: List[str] = []
-    for raw in values:
-        if not raw:
-            continue
-        if "," in raw:
-            parsed.extend(item.strip() for item in raw.split(",") if item.strip())
-        else:
-            stripped = raw.strip()
-            if stripped:
-                parsed.append(stripped)
-    return parsed
+def _json_response(payload: object) -> Response:
+    # orjson encodes in C and handles tuples directly, so payloads can hand
+    # over cached tuples without copying them into lists first.
+    return app.response_class(orjson.dumps(payload), mimetype="application/json")
+
+
+def _solutions_dir_mtime() -> float:
+    try:
+        return SOLUTIONS_DIR.stat().st_mtime
+    except OSError:
+        return 0.0
 
 
-@lru_cache(maxsize=1)
 def _scan_solution_files() -> Dict[Tuple[int, int, str], str]:
+    # One stat per call; the directory is only rescanned when files have been
+    # added, removed or renamed since the last scan.
+    return _solution_index(_solutions_dir_mtime())
+
+
+@lru_cache(maxsize=1)
+def _solution_index(mtime: float) -> Dict[Tuple[int, int, str], str]:
     index: Dict[Tuple[int, int, str], str] = {}
     if not SOLUTIONS_DIR.exists():
         return index
 
-    pattern = re.compile(r"^solutions_(\d+)_(\d+)(?:_(4trait|44trait))?\.txt$")
-    for path in SOLUTIONS_DIR.glob("solutions_*.txt"):
-        match = pattern.match(path.name)
+    with os.scandir(SOLUTIONS_DIR) as entries:
+        # is_file() is answered from the directory listing on most platforms.
+        files = [(entry.name, entry.path) for entry in entries if entry.is_file()]
+
+    for name, path in files:
+        match = SOLUTION_FILENAME_PATTERN.match(name)
         if not match:
             continue
         size = int(match.group(1))
@@ -179,55 +203,173 @@ def _scan_solution_files() -> Dict[Tuple[int, int, str], str]:
             option = "4trait"
         elif suffix == "44trait":
             option = "44trait"
-        index[(size, trait_value, option)] = str(path)
+        index[(size, trait_value, option)] = path
     return index
 
 
 
-def _iter_solutions(file_path: str) -> Iterator[SolutioMask]:
-    path = Path(file_path)
-    if not path.exists():
-        return
-
-    with path.open("r", encoding="utf-8") as handle:
-        for raw_line in handle:
-            line = raw_line.strip()
-            if not line:
-                continue
-            parts = line.split(",")
-            yield SolutioMask(
-                cards=int(parts[0]),
-                traits=int(parts[1]),
-            )
-
-
-def _solution_matches_filters(
-    solution: SolutioMask,
-    requiredCardsMask: int,
-    forbiddenCardsMask: int,
-    traitsMax1Mask: int,
-    traitsMin2Mask: int,
-    traitsMin4Mask: int,
-) -> bool:
-    
-    return (
-        filterCardsRequired(requiredCardsMask, solution.cards) and
-        filterCardsForbidden(forbiddenCardsMask, solution.cards) and
-        filterTraitsMax1(traitsMax1Mask, solution.traits) and
-        filterTraitsMin2(traitsMin2Mask, solution.traits) and
-        filterTraitsMin4(traitsMin4Mask, solution.traits) 
-)
+def _solution_columns(cards: np.ndarray, traits: np.ndarray) -> SolutionColumns:
+    if not len(cards):
+        return SolutionColumns(cards=cards, traits=traits, cards_any=0, cards_all=0, traits_any=0, traits_all=0)
+    return SolutionColumns(
+        cards=cards,
+        traits=traits,
+        cards_any=int(np.bitwise_or.reduce(cards)),
+        cards_all=int(np.bitwise_and.reduce(cards)),
+        traits_any=int(np.bitwise_or.reduce(traits)),
+        traits_all=int(np.bitwise_and.reduce(traits)),
+    )
 
-def _decode_solutions(solutions: List[int, SolutioMask]) -> List[SolutionData]:
+
+def _parse_solutions(file_path: str) -> SolutionColumns:
+    # Callers take file_path from _scan_solution_files, so it is known to exist.
+    parts: List[np.ndarray] = []
+    with open(file_path, "rb") as handle:
+        # mmap refuses empty files, and there is nothing to parse anyway.
+        if os.fstat(handle.fileno()).st_size:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                # Every line is '<cards>,<traits>'. With the commas turned into
+                # whitespace a run of lines is one run of integers that NumPy
+                # parses in a single C call; blank lines are just more
+                # whitespace. Chunks end on a line break so the pairs stay
+                # aligned, and only one chunk of text is copied out at a time.
+                start = 0
+                while start < len(data):
+                    end = data.find(b"\n", start + PARSE_CHUNK_SIZE) + 1 or len(data)
+                    chunk = data[start:end]
+                    start = end
+                    # np.fromstring reads whitespace-only text as a single 0,
+                    # so blank chunks (e.g. trailing newlines past a chunk
+                    # boundary, or an empty file) are skipped.
+                    if not chunk.strip():
+                        continue
+                    values = np.fromstring(chunk.replace(b",", b" "), dtype=np.uint64, sep=" ")
+                    # Older NumPy stops at a malformed token and returns what
+                    # it parsed so far, so check that every line gave exactly
+                    # its two integers. Partial data is never cached.
+                    if values.size != 2 * chunk.count(b","):
+                        raise ValueError(f"{file_path}: expected a '<cards>,<traits>' pair on every line")
+                    parts.append(values)
+    masks = np.concatenate(parts) if parts else np.empty(0, dtype=np.uint64)
+    return _solution_columns(np.ascontiguousarray(masks[0::2]), np.ascontiguousarray(masks[1::2]))
+
+
+@lru_cache(maxsize=64)
+def _load_solutions(file_path: str, size: int, mtime_ns: int) -> SolutionColumns:
+    # Size and mtime are part of the cache key so a rewritten file gets
+    # reloaded, even when it was copied in with an older mtime preserved.
+    return _parse_solutions(file_path)
+
+
+# Many solutions share the same trait mask, so the JSON-ready entries are
+# cached and shared between responses. They must not be mutated.
+@lru_cache(maxsize=4096)
+def _decoded_traits(traitsMask: int) -> Tuple[Dict[str, object], ...]:
+    return tuple({"name": name, "count": count} for name, count in decodeTraitsMask(traitsMask))
+
+def _decode_solutions(
+    columns: SolutionColumns,
+    page_rows: np.ndarray,
+    start_index: int,
+) -> List[SolutionData]:
+    # Gather the page's rows with one fancy-index per column, convert them to
+    # Python ints in bulk and decode straight into SolutionData.
+    cards = columns.cards[page_rows].tolist()
+    traits = columns.traits[page_rows].tolist()
     return [SolutionData(
-        identifier=index,
-        traits=tuple(decodeTraitsMask(solution.traits)),
-        cards=tuple(decodeCardsMask(solution.cards))
-    ) for index, solution in solutions]
+        identifier=start_index + offset,
+        traits=_decoded_traits(trait_mask),
+        cards=tuple(decodeCardsMask(card_mask))
+    ) for offset, (card_mask, trait_mask) in enumerate(zip(cards, traits))]
+
+# Users tend to repeat the same filter combinations (paging, reloads), so the
+# five masks are memoized per query.
+@lru_cache(maxsize=1024)
+def _build_filter_masks(
+    required_cards: FrozenSet[str],
+    forbidden_cards: FrozenSet[str],
+    traits_max1: FrozenSet[str],
+    traits_min2: FrozenSet[str],
+    traits_min4: FrozenSet[str],
+) -> Tuple[int, int, int, int, int]:
+    return (
+        cardsRequiredFilterMask(list(required_cards)),
+        cardsForbiddenFilterMask(list(forbidden_cards)),
+        traitsMax1FilterMask(list(traits_max1)),
+        traitMin2FilterMask(list(traits_min2)),
+        traitMin4FilterMask(list(traits_min4)),
+    )
+
+def _page_rows(
+    keep: np.ndarray,
+    block_counts: List[int],
+    start_index: int,
+    limit: int,
+) -> np.ndarray:
+    # Only the blocks holding matches start_index .. start_index + limit - 1
+    # are turned into row positions; the counts let us skip the rest.
+    page_rows: List[np.ndarray] = []
+    found = 0
+    matches_before = 0
+    for block_index, count in enumerate(block_counts):
+        if matches_before + count > start_index:
+            block_start = block_index * CANCELLATION_CHECK_INTERVAL
+            block_rows = np.flatnonzero(keep[block_start:block_start + CANCELLATION_CHECK_INTERVAL]) + block_start
+            block_rows = block_rows[max(start_index - matches_before, 0):][:limit - found]
+            page_rows.append(block_rows)
+            found += len(block_rows)
+            if found >= limit:
+                break
+        matches_before += count
+    return np.concatenate(page_rows) if page_rows else np.empty(0, dtype=np.intp)
+
+def _filter_blocks(
+    columns: SolutionColumns,
+    checks: List[Tuple[np.ndarray, np.uint64, np.uint64]],
+    client_ip: str,
+    token: int,
+) -> Optional[Tuple[np.ndarray, List[int]]]:
+    # Returns the per-row keep mask for the whole file (each block writes its
+    # slice) and the match count per block, or None when the request was
+    # superseded.
+    keep_all = np.empty(len(columns.cards), dtype=bool)
+    block_counts: List[int] = []
+    # Scratch buffers reused by every block so the checks allocate no
+    # temporaries inside the loop.
+    buffer_size = min(len(columns.cards), CANCELLATION_CHECK_INTERVAL)
+    masked_buffer = np.empty(buffer_size, dtype=np.uint64)
+    passed_buffer = np.empty(buffer_size, dtype=bool)
+
+    # The filters run over whole blocks of solutions at once; the cancellation
+    # token is checked before each block. We perform a plain dict read (no
+    # lock) for this check — this is safe on CPython (single dict access is
+    # atomic) and the write-side always uses REQUEST_LOCK so we won't observe
+    # a crash; at worst we'll see a slightly stale value for a short time
+    # which is acceptable for cancellation semantics. A client evicted from
+    # REQUEST_TOKENS has no newer request, so a missing entry never cancels.
+    tokens = REQUEST_TOKENS
+    for block_start in range(0, len(columns.cards), CANCELLATION_CHECK_INTERVAL):
+        current = tokens.get(client_ip, token)
+        if current != token:
+            return None
+
+        block = slice(block_start, block_start + CANCELLATION_CHECK_INTERVAL)
+        keep = keep_all[block]
+        masked = masked_buffer[:len(keep)]
+        passed = passed_buffer[:len(keep)]
+        keep.fill(True)
+        # The fused per-column checks from _collect_filtered_page.
+        for column, mask, expected in checks:
+            np.bitwise_and(column[block], mask, out=masked)
+            np.equal(masked, expected, out=passed)
+            keep &= passed
+        block_counts.append(int(np.count_nonzero(keep)))
+
+    return keep_all, block_counts
 
 def _collect_filtered_page(
     file_path: str,
-    start_index: int,
+    requested_page: int,
     limit: int,
     required_cards: Set[str],
     forbidden_cards: Set[str],
@@ -236,105 +378,157 @@ def _collect_filtered_page(
     traits_min4: Set[str],
     client_ip: str,
     token: int,
-) -> Tuple[int, List[SolutionData], List[SolutionData], bool]:
-    total_matches = 0
-    requested_entries_masked: List[Tuple[int, SolutioMask]] = []
-    tail_entries_masked: deque[Tuple[int, SolutioMask]] = deque(maxlen=limit)
-
+) -> Tuple[int, int, List[SolutionData], bool]:
     # Precompute filter masks
-    requiredCardsMask = cardsRequiredFilterMask(list(required_cards))
-    forbiddenCardsMask = cardsForbiddenFilterMask(list(forbidden_cards))
-    traitsMax1Mask = traitsMax1FilterMask(list(traits_max1))
-    traitsMin2Mask = traitMin2FilterMask(list(traits_min2))
-    traitsMin4Mask = traitMin4FilterMask(list(traits_min4))
-
-    # To avoid the overhead of acquiring a lock on every iteration we check
-    # the cancellation token only every `CANCELLATION_CHECK_INTERVAL`
-    # iterations. We perform a plain dict read (no lock) for the quick-path
-    # check — this is safe on CPython (single dict access is atomic) and the
-    # write-side always uses REQUEST_LOCK so we won't observe a crash; at
-    # worst we'll see a slightly stale value for a short time which is
-    # acceptable for cancellation semantics.
-    iterations_since_check = 0
-    for solution in _iter_solutions(file_path):
-        iterations_since_check += 1
-        if iterations_since_check >= CANCELLATION_CHECK_INTERVAL:
-            iterations_since_check = 0
-            # read without lock for performance; use the locked path only if
-            # you need a strict memory-model guarantee across Python
-            current = REQUEST_TOKENS.get(client_ip, 0)
-            if current != token:
-                return (0, [], [], True)
-        if not _solution_matches_filters(
-            solution,
-            requiredCardsMask,
-            forbiddenCardsMask,
-            traitsMax1Mask,
-            traitsMin2Mask,
-            traitsMin4Mask,
-        ):
-            continue
-
-        match_index = total_matches
-        total_matches += 1
+    (
+        requiredCardsMask,
+        forbiddenCardsMask,
+        traitsMax1Mask,
+        traitsMin2Mask,
+        traitsMin4Mask,
+    ) = _build_filter_masks(
+        frozenset(required_cards),
+        frozenset(forbidden_cards),
+        frozenset(traits_max1),
+        frozenset(traits_min2),
+        frozenset(traits_min4),
+    )
 
-        if start_index <= match_index < start_index + limit:
-            requested_entries_masked.append((match_index, solution))
+    # A card both required and forbidden, or a trait both capped at 1 and
+    # required at 2+, can never match.
+    if requiredCardsMask & forbiddenCardsMask or traitsMax1Mask & (traitsMin2Mask | traitsMin4Mask):
+        return (0, 1, [], False)
+
+    stat = os.stat(file_path)
+    columns = _load_solutions(file_path, stat.st_size, stat.st_mtime_ns)
+
+    # Without such conflicts the five filters fold into one check per column
+    # that keeps their semantics: required cards and min 2/4 traits need all
+    # their bits set ((mask & x) == mask), forbidden cards and max 1 traits
+    # none of theirs ((mask & x) == 0), so the bits the filters look at must
+    # equal the bits they require.
+    # Entries are (column, bits set in any row, bits set in every row, filter
+    # mask, expected masked value).
+    column_checks = [
+        (columns.cards, columns.cards_any, columns.cards_all,
+         requiredCardsMask | forbiddenCardsMask, requiredCardsMask),
+        (columns.traits, columns.traits_any, columns.traits_all,
+         traitsMax1Mask | traitsMin2Mask | traitsMin4Mask, traitsMin2Mask | traitsMin4Mask),
+    ]
+    checks = []
+    for column, any_bits, all_bits, mask, expected in column_checks:
+        rejected = mask & ~expected
+        # A required bit no solution has, or a rejected bit every solution
+        # has, rules out the whole file (e.g. min 4 of a two-card trait).
+        if (any_bits & expected) != expected or all_bits & rejected:
+            return (0, 1, [], False)
+        # Likewise the check is skipped when every solution passes it, which
+        # includes empty filters.
+        if (all_bits & expected) == expected and not any_bits & rejected:
+            continue
+        checks.append((column, np.uint64(mask), np.uint64(expected)))
+
+    if checks:
+        filtered = _filter_blocks(columns, checks, client_ip, token)
+        if filtered is None:
+            return (0, 1, [], True)
+        keep_all, block_counts = filtered
+        total_matches = sum(block_counts)
+    else:
+        # Nothing narrows this file down, so every solution matches and
+        # pages map straight onto row positions.
+        total_matches = len(columns.cards)
+    if total_matches == 0:
+        return (0, 1, [], False)
 
-        tail_entries_masked.append((match_index, solution))
+    # Pages past the end fall back to the last page.
+    page = min(requested_page, -(-total_matches // limit))
+    start_index = (page - 1) * limit
+    if checks:
+        page_rows = _page_rows(keep_all, block_counts, start_index, limit)
+    else:
+        page_rows = np.arange(start_index, min(start_index + limit, total_matches))
 
     return (
         total_matches,
-        _decode_solutions(requested_entries_masked),
-        _decode_solutions(list(tail_entries_masked)),
+        page,
+        _decode_solutions(columns, page_rows, start_index),
         False,
     )
 
 
-@lru_cache(maxsize=512)
+@lru_cache(maxsize=1)
+def _asset_index() -> Dict[Tuple[str, str], Path]:
+    index: Dict[Tuple[str, str], Path] = {}
+    for asset_type in ALLOWED_ASSET_TYPES:
+        asset_dir = ASSETS_DIR / asset_type
+        if not asset_dir.is_dir():
+            continue
+        with os.scandir(asset_dir) as entries:
+            files = [(os.path.splitext(entry.name), entry.path) for entry in entries if entry.is_file()]
+        # Keys are lowercased like the requested names. When a name exists with
+        # several extensions, the earlier extension wins.
+        for ext in ASSET_EXTENSIONS:
+            for (stem, suffix), path in files:
+                if suffix.lower() == ext:
+                    index.setdefault((asset_type, stem.lower()), Path(path))
+    return index
+
+
 def _find_asset(asset_type: str, name: str) -> Path | None:
     clean = name.strip().lower()
     if not clean:
         return None
-    for ext in (".webp", ".png", ".jpg", ".jpeg"):
-        candidate = ASSETS_DIR / asset_type / f"{clean}{ext}"
-        if candidate.exists():
-            return candidate
-    return None
+    return _asset_index().get((asset_type, clean))
 
 
 # Map of client_ip -> latest token (int). When a new request arrives we bump the
 # token so any earlier in-flight processing can detect the mismatch and stop.
-REQUEST_TOKENS: Dict[str, int] = {}
+# Kept in write order and capped at REQUEST_TOKENS_LIMIT clients so it cannot
+# grow without bound; only modify it through _store_request_token.
+REQUEST_TOKENS: "OrderedDict[str, int]" = OrderedDict()
+REQUEST_TOKENS_LIMIT = 1024
 REQUEST_LOCK = threading.Lock()
 
 
+def _store_request_token(client_key: str, token: int) -> None:
+    # Caller must hold REQUEST_LOCK.
+    REQUEST_TOKENS[client_key] = token
+    REQUEST_TOKENS.move_to_end(client_key)
+    while len(REQUEST_TOKENS) > REQUEST_TOKENS_LIMIT:
+        REQUEST_TOKENS.popitem(last=False)
+
+
 @app.get("/")
 def index():
     return render_template("index.html")
 
 
-@app.get("/api/metadata")
-def api_metadata():
-    index = _scan_solution_files()
-    deck_sizes = sorted({size for size, _, _ in index.keys()})
+@lru_cache(maxsize=1)
+def _metadata_payload(mtime: float) -> bytes:
+    # Derived only from the solution file index, so the encoded body is built
+    # once per version of the solutions directory and served as is.
+    index = _solution_index(mtime)
+
+    # One pass over the index groups the available options by size and trait
+    # value; the sorted, string-keyed views are built from that.
+    options_by_size: Dict[int, Dict[int, Dict[str, bool]]] = {}
+    for size, trait, option in index:
+        options = options_by_size.setdefault(size, {}).setdefault(
+            trait, {"base": False, "4trait": False, "44trait": False}
+        )
+        options[option] = True
+    deck_sizes = sorted(options_by_size)
 
     trait_values_by_size: Dict[str, List[int]] = {}
     option_availability: Dict[str, Dict[str, Dict[str, bool]]] = {}
 
     for size in deck_sizes:
-        trait_values = sorted({trait for (s, trait, _) in index.keys() if s == size})
+        options_by_trait = options_by_size[size]
+        trait_values = sorted(options_by_trait)
         size_key = str(size)
         trait_values_by_size[size_key] = trait_values
-        option_availability[size_key] = {}
-        for trait in trait_values:
-            trait_key = str(trait)
-            options = {
-                "base": (size, trait, "base") in index,
-                "4trait": (size, trait, "4trait") in index,
-                "44trait": (size, trait, "44trait") in index,
-            }
-            option_availability[size_key][trait_key] = options
+        option_availability[size_key] = {str(trait): options_by_trait[trait] for trait in trait_values}
 
     if deck_sizes:
         default_size = 6 if 6 in deck_sizes else deck_sizes[0]
@@ -356,18 +550,35 @@ def api_metadata():
         default_trait_value = None
         default_option = "base"
 
-    return jsonify(
-        {
-            "deckSizes": deck_sizes,
-            "traitValuesBySize": trait_values_by_size,
-            "optionAvailability": option_availability,
-            "defaultDeckSize": default_size,
-            "defaultTraitValue": default_trait_value,
-            "defaultTraitOption": default_option,
-            "limit": DISPLAY_LIMIT,
-            "hasData": bool(index),
-        }
-    )
+    return orjson.dumps({
+        "deckSizes": deck_sizes,
+        "traitValuesBySize": trait_values_by_size,
+        "optionAvailability": option_availability,
+        "defaultDeckSize": default_size,
+        "defaultTraitValue": default_trait_value,
+        "defaultTraitOption": default_option,
+        "limit": DISPLAY_LIMIT,
+        "hasData": bool(index),
+    })
+
+
+@lru_cache(maxsize=1)
+def _metadata_etag(mtime: float) -> str:
+    return hashlib.blake2b(_metadata_payload(mtime), digest_size=8).hexdigest()
+
+
+@app.get("/api/metadata")
+def api_metadata():
+    mtime = _solutions_dir_mtime()
+    etag = _metadata_etag(mtime)
+    # If-None-Match uses weak comparison, so a W/ tag (e.g. after a gzip
+    # proxy weakened it) still gets the 304.
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(_metadata_payload(mtime), mimetype="application/json")
+    response.set_etag(etag)
+    return response
 
 
 @app.get("/api/options")
@@ -387,7 +598,7 @@ def api_options():
     if not file_path:
         abort(404, description="No solutions available for the requested combination")
 
-    return jsonify({"cards": CARD_LIST, "traits": TRAIT_LIST})
+    return app.response_class(OPTIONS_BODY, mimetype="application/json")
 
 
 @app.get("/api/solutions")
@@ -432,8 +643,6 @@ def api_solutions():
         requested_page = 1
     requested_page = max(1, requested_page)
 
-    start_index = (requested_page - 1) * limit
-
     # client identification: prefer client-supplied `clientId` and `requestId`.
     # If absent, fall back to IP-based behavior for compatibility.
     client_id_arg = request.args.get("clientId")
@@ -456,16 +665,16 @@ def api_solutions():
         with REQUEST_LOCK:
             prev = REQUEST_TOKENS.get(client_key, 0)
             if request_id > prev:
-                REQUEST_TOKENS[client_key] = request_id
+                _store_request_token(client_key, request_id)
     else:
         # Older clients: bump token so in-flight work is invalidated.
         with REQUEST_LOCK:
             request_id = REQUEST_TOKENS.get(client_key, 0) + 1
-            REQUEST_TOKENS[client_key] = request_id
+            _store_request_token(client_key, request_id)
 
-    total_matches, requested_entries, tail_entries, cancelled = _collect_filtered_page(
+    total_matches, page, entries, cancelled = _collect_filtered_page(
         file_path,
-        start_index,
+        requested_page,
         limit,
         required_cards,
         forbidden_cards,
@@ -477,33 +686,20 @@ def api_solutions():
     )
 
     if cancelled:
-        return jsonify({"cancelled": True}), 200
+        return _json_response({"cancelled": True})
 
-    if total_matches == 0:
-        total_pages = 0
-        page = 1
-        entries: List[SolutionData] = []
-    else:
-        total_pages = math.ceil(total_matches / limit)
-        page = min(requested_page, total_pages)
-        if page == requested_page:
-            entries = requested_entries
-        else:
-            adjusted_start = (page - 1) * limit
-            entries = [entry for entry in tail_entries if entry.identifier >= adjusted_start]
+    total_pages = -(-total_matches // limit)
 
     results = [
         {
             "displayId": solution.identifier + 1,
-            "cards": list(solution.cards),
-            "traits": [
-                {"name": name, "count": count} for name, count in solution.traits
-            ],
+            "cards": solution.cards,
+            "traits": solution.traits,
         }
         for solution in entries
     ]
 
-    return jsonify(
+    return _json_response(
         {
             "page": page,
             "limit": limit,
@@ -516,14 +712,16 @@ def api_solutions():
 @app.route('/favicon.ico')
 def favicon():
     path = ASSETS_DIR / "favicon.ico"
-    return send_file(path, mimetype='image/vnd.microsoft.icon')
+    if not path.exists():
+        abort(404)
+    return send_file(path, mimetype='image/vnd.microsoft.icon', max_age=ASSET_MAX_AGE)
 
 @app.get("/assets/logo.png")
 def serve_logo():
     path = ASSETS_DIR / "logo.png"
     if not path.exists():
         abort(404)
-    return send_file(path, mimetype="image/png")
+    return send_file(path, mimetype="image/png", max_age=ASSET_MAX_AGE)
 
 
 @app.get("/assets/merge_tactics_logo.webp")
@@ -531,7 +729,7 @@ def serve_seasonal_logo():
     path = ASSETS_DIR / "merge_tactics_logo.webp"
     if not path.exists():
         abort(404)
-    return send_file(path, mimetype="image/webp")
+    return send_file(path, mimetype="image/webp", max_age=ASSET_MAX_AGE)
 
 
 @app.get("/assets/header_backround.png")
@@ -539,7 +737,7 @@ def serve_header_background():
     path = ASSETS_DIR / "header_backround.png"
     if not path.exists():
         abort(404)
-    return send_file(path, mimetype="image/png")
+    return send_file(path, mimetype="image/png", max_age=ASSET_MAX_AGE)
 
 
 @app.get("/assets/<asset_type>")
@@ -552,7 +750,27 @@ def serve_asset(asset_type: str):
     if not path:
         abort(404)
     mimetype = MIME_TYPES.get(path.suffix.lower(), "application/octet-stream")
-    return send_file(path, mimetype=mimetype)
+    return send_file(path, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+
+
+def _warm_caches() -> None:
+    mtime = _solutions_dir_mtime()
+    for file_path in _solution_index(mtime).values():
+        try:
+            stat = os.stat(file_path)
+            _load_solutions(file_path, stat.st_size, stat.st_mtime_ns)
+        except (OSError, ValueError):
+            # Keep warming the other files (removed, unreadable or malformed
+            # ones are skipped); requests for this one still fail.
+            app.logger.exception("Could not load %s", file_path)
+    # Builds the metadata payload as well.
+    _metadata_etag(mtime)
+    _asset_index()
+
+
+# Prefill the caches in the background so the first requests after boot do not
+# pay for parsing every solution file. Runs under gunicorn too.
+threading.Thread(target=_warm_caches, name="warm-caches", daemon=True).start()
 
 
 if __name__ == "__main__":